@@ -5,6 +5,7 @@ It checks for existing resources before creating new ones.
 """
 
 import os
+import hashlib
 import sys
 import time
 import boto3
@@ -13,14 +14,61 @@ import pprint
 import json
 import warnings
 from pathlib import Path
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from botocore.config import Config
+from s3transfer.subscribers import BaseSubscriber
 from botocore.exceptions import ClientError
 
+# Make the local utils package importable regardless of the working directory
+sys.path.append(str(Path(__file__).resolve().parent))
+from utils.knowledge_base import BedrockKnowledgeBase
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 warnings.filterwarnings('ignore')
 
-def check_s3_bucket_exists(s3_client, bucket_name):
+# Suffix of the knowledge base reused when kbAlreadyExists is set in main
+EXISTING_KB_SUFFIX = "0232519"
+
+# Number of S3 requests upload_directory keeps in flight
+UPLOAD_MAX_WORKERS = 32
+
+# Shared client settings: a connection pool large enough for the upload
+# workers and adaptive retries to ride out throttling
+CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={'max_attempts': 10, 'mode': 'adaptive'}
+)
+
+# The runtime client sits idle between REPL queries, so keep its pooled
+# connections alive rather than reconnecting after each pause
+RUNTIME_CLIENT_CONFIG = CLIENT_CONFIG.merge(Config(tcp_keepalive=True))
+
+# Page size for Bedrock Agent list calls (the service maximum)
+LIST_PAGE_SIZE = 1000
+
+# Number of get_data_source calls issued concurrently
+DATA_SOURCE_MAX_WORKERS = 16
+
+# How long a generated answer is reused for a repeated REPL query
+RESPONSE_CACHE_TTL_SECONDS = 60 * 60
+
+# Multipart settings for the transfer manager shared by all uploads.
+# max_concurrency is the size of the manager's worker pool and caps
+# in-flight requests across every file.
+TRANSFER_CONFIG = TransferConfig(
+    max_concurrency=UPLOAD_MAX_WORKERS,
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=50 * 1024 * 1024,
+    io_chunksize=1024 * 1024,
+    use_threads=True
+)
+
+def check_s3_bucket_exists(s3_client: Any, bucket_name: str) -> bool:
     """Check if an S3 bucket exists"""
     try:
         s3_client.head_bucket(Bucket=bucket_name)
@@ -30,7 +78,7 @@ def check_s3_bucket_exists(s3_client, bucket_name):
         logger.info(f"S3 bucket {bucket_name} does not exist")
         return False
 
-def create_s3_bucket_if_not_exists(s3_client, bucket_name, region):
+def create_s3_bucket_if_not_exists(s3_client: Any, bucket_name: str, region: str) -> bool:
     """Create an S3 bucket if it doesn't exist"""
     if check_s3_bucket_exists(s3_client, bucket_name):
         return True
@@ -49,7 +97,7 @@ def create_s3_bucket_if_not_exists(s3_client, bucket_name, region):
         logger.error(f"Error creating S3 bucket {bucket_name}: {e}")
         return False
 
-def check_opensearch_collection_exists(aoss_client, collection_name):
+def check_opensearch_collection_exists(aoss_client: Any, collection_name: str) -> Optional[dict]:
     """Check if an OpenSearch Serverless collection exists"""
     try:
         collections = aoss_client.batch_get_collection(names=[collection_name])
@@ -61,17 +109,22 @@ def check_opensearch_collection_exists(aoss_client, collection_name):
         logger.error(f"Error checking OpenSearch collection: {e}")
         return None
 
-def get_existing_knowledge_base(bedrock_agent_client, kb_name):
+def get_existing_knowledge_base(
+    bedrock_agent_client: Any, kb_name: str
+) -> Tuple[Optional[dict], Optional[List[dict]]]:
     """Get a handle to an existing knowledge base"""
     try:
-        # List knowledge bases and find the one with the matching name
-        kbs = bedrock_agent_client.list_knowledge_bases(maxResults=100)
+        # Page through all knowledge bases and find the one with the matching name
+        paginator = bedrock_agent_client.get_paginator('list_knowledge_bases')
         kb_id = None
-        
-        for kb in kbs.get('knowledgeBaseSummaries', []):
-            if kb['name'] == kb_name:
-                kb_id = kb['knowledgeBaseId']
-                logger.info(f"Found existing knowledge base with ID: {kb_id}")
+
+        for page in paginator.paginate(PaginationConfig={'PageSize': LIST_PAGE_SIZE}):
+            for kb in page.get('knowledgeBaseSummaries', []):
+                if kb['name'] == kb_name:
+                    kb_id = kb['knowledgeBaseId']
+                    logger.info(f"Found existing knowledge base with ID: {kb_id}")
+                    break
+            if kb_id:
                 break
                 
         if kb_id:
@@ -79,18 +132,25 @@ def get_existing_knowledge_base(bedrock_agent_client, kb_name):
             kb = response['knowledgeBase']
             
             # Get data sources for this KB
-            ds_list = bedrock_agent_client.list_data_sources(
+            ds_paginator = bedrock_agent_client.get_paginator('list_data_sources')
+            ds_list = []
+            for page in ds_paginator.paginate(
                 knowledgeBaseId=kb_id,
-                maxResults=100
-            ).get('dataSourceSummaries', [])
+                PaginationConfig={'PageSize': LIST_PAGE_SIZE}
+            ):
+                ds_list.extend(page.get('dataSourceSummaries', []))
             
-            data_sources = []
-            for ds in ds_list:
-                ds_response = bedrock_agent_client.get_data_source(
-                    dataSourceId=ds['dataSourceId'],
-                    knowledgeBaseId=kb_id
-                )
-                data_sources.append(ds_response['dataSource'])
+            # Fetch data source details concurrently, preserving list order
+            with ThreadPoolExecutor(max_workers=DATA_SOURCE_MAX_WORKERS) as executor:
+                futures = [
+                    executor.submit(
+                        bedrock_agent_client.get_data_source,
+                        dataSourceId=ds['dataSourceId'],
+                        knowledgeBaseId=kb_id
+                    )
+                    for ds in ds_list
+                ]
+                data_sources = [future.result()['dataSource'] for future in futures]
                 
             return kb, data_sources
         else:
@@ -100,20 +160,205 @@ def get_existing_knowledge_base(bedrock_agent_client, kb_name):
         logger.error(f"Error getting existing knowledge base: {e}")
         return None, None
 
-def upload_directory(s3_client, local_path, bucket_name):
-    """Upload a directory to an S3 bucket"""
+def list_bucket_objects(s3_client: Any, bucket_name: str) -> Dict[str, Tuple[int, str]]:
+    """Map each key in a bucket to its (size, etag)"""
+    objects: Dict[str, Tuple[int, str]] = {}
+    try:
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket_name):
+            for obj in page.get('Contents', []):
+                objects[obj['Key']] = (obj['Size'], obj['ETag'].strip('"'))
+    except ClientError as e:
+        logger.warning(f"Could not list objects in bucket {bucket_name}: {e}")
+    return objects
+
+def compute_s3_etag(file_path: str) -> str:
+    """Compute the ETag S3 assigns to a file uploaded with TRANSFER_CONFIG"""
+    part_size = TRANSFER_CONFIG.multipart_chunksize
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < TRANSFER_CONFIG.multipart_threshold:
+            return hashlib.md5(f.read()).hexdigest()
+        digests = [hashlib.md5(part).digest() for part in iter(lambda: f.read(part_size), b'')]
+    return f"{hashlib.md5(b''.join(digests)).hexdigest()}-{len(digests)}"
+
+def compute_dataset_token(fingerprints: Dict[str, str]) -> str:
+    """Hash a mapping of S3 key to content ETag into a stable ingestion idempotency token"""
+    digest = hashlib.sha256()
+    for key, fingerprint in sorted(fingerprints.items()):
+        digest.update(f"{key}\0{fingerprint}\n".encode())
+    return digest.hexdigest()
+
+def walk_files(path: str) -> Iterator[Tuple[str, int]]:
+    """Yield (file_path, size) for every file under path, using cached scandir stat data.
+    Directories that cannot be read are logged and skipped, as os.walk does."""
+    try:
+        entries = list(os.scandir(path))
+    except OSError as e:
+        logger.warning(f"Skipping unreadable directory {path}: {e}")
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from walk_files(entry.path)
+        elif entry.is_file():
+            yield entry.path, entry.stat().st_size
+
+def upload_directory(s3_client: Any, local_path: str, bucket_name: str) -> str:
+    """Upload a directory to an S3 bucket and return a token identifying the uploaded dataset"""
     logger.info(f"Uploading directory {local_path} to bucket {bucket_name}")
-    for root, dirs, files in os.walk(local_path):
-        for file in files:
-            file_path = os.path.join(root, file)
-            s3_key = os.path.relpath(file_path, local_path)
-            logger.info(f"Uploading file {file_path} to {bucket_name}/{s3_key}")
+    existing_objects = list_bucket_objects(s3_client, bucket_name)
+    with create_transfer_manager(s3_client, TRANSFER_CONFIG) as manager, \
+            ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as hasher:
+        # Queue every file on the manager's worker pool up front and only then
+        # wait, so small files upload concurrently rather than one at a time
+        futures = []
+        # Key -> content ETag of every file, for the dataset token
+        fingerprints: Dict[str, str] = {}
+
+        def submit(file_path: str, s3_key: str) -> None:
+            logger.debug("Uploading file %s to %s/%s", file_path, bucket_name, s3_key)
+            futures.append((file_path, manager.upload(file_path, bucket_name, s3_key)))
+
+        # Every file is hashed on a thread pool (hashlib releases the GIL for
+        # large buffers). Files whose key already exists with the same size wait
+        # for their hash to decide whether to upload; everything else starts
+        # uploading during the walk.
+        hash_futures = []
+        # walk_files builds paths by joining onto local_path, so keys are a plain
+        # slice of each path; S3 keys always use forward slashes
+        prefix_len = len(os.path.join(local_path, ''))
+        for file_path, size in walk_files(local_path):
+            s3_key = file_path[prefix_len:]
+            if os.sep != '/':
+                s3_key = s3_key.replace(os.sep, '/')
+            existing = existing_objects.get(s3_key)
+            is_candidate = bool(existing and existing[0] == size)
+            if not is_candidate:
+                submit(file_path, s3_key)
+            hash_futures.append((file_path, s3_key, is_candidate, hasher.submit(compute_s3_etag, file_path)))
+
+        skipped = 0
+        for file_path, s3_key, is_candidate, hash_future in hash_futures:
             try:
-                s3_client.upload_file(file_path, bucket_name, s3_key)
+                etag = hash_future.result()
+            except Exception as e:
+                logger.error(f"Error hashing file {file_path}: {e}")
+                fingerprints[s3_key] = "unreadable"
+                if is_candidate:
+                    # Can't tell whether it changed, so upload it and let that report any error
+                    submit(file_path, s3_key)
+                continue
+            fingerprints[s3_key] = etag
+            if not is_candidate:
+                continue
+            if etag == existing_objects[s3_key][1]:
+                skipped += 1
+            else:
+                submit(file_path, s3_key)
+
+        logger.info(f"Queued {len(futures)} files for upload to bucket {bucket_name}")
+        for file_path, future in futures:
+            try:
+                future.result()
             except Exception as e:
                 logger.error(f"Error uploading file {file_path}: {e}")
 
-def main():
+    if skipped:
+        logger.info(f"Skipped {skipped} unchanged files already in bucket {bucket_name}")
+    return compute_dataset_token(fingerprints)
+
+class KnownSizeSubscriber(BaseSubscriber):
+    """Give the transfer manager an object size it would otherwise fetch with HeadObject"""
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+
+    def on_queued(self, future: Any, **kwargs: Any) -> None:
+        future.meta.provide_transfer_size(self._size)
+
+def copy_s3_prefix(s3_client: Any, source_uri: str, bucket_name: str) -> str:
+    """Copy every object under an s3://bucket/prefix URI into a bucket, server-side,
+    and return a token identifying the copied dataset"""
+    if not source_uri.startswith("s3://"):
+        raise ValueError(f"Expected an s3://bucket/prefix URI, got {source_uri}")
+    source_bucket, _, source_prefix = source_uri[len("s3://"):].partition('/')
+    # Treat the prefix as a folder so s3://src/data does not also match database/
+    if source_prefix and not source_prefix.endswith('/'):
+        source_prefix += '/'
+    logger.info(f"Copying objects from {source_uri} to bucket {bucket_name}")
+    with create_transfer_manager(s3_client, TRANSFER_CONFIG) as manager:
+        # The transfer manager switches to multipart UploadPartCopy for objects
+        # above the multipart threshold, so large objects copy in parallel parts
+        futures = []
+        fingerprints: Dict[str, str] = {}
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=source_bucket, Prefix=source_prefix):
+            for obj in page.get('Contents', []):
+                source_key = obj['Key']
+                s3_key = source_key[len(source_prefix):]
+                if not s3_key:
+                    continue
+                logger.debug("Copying s3://%s/%s to %s/%s", source_bucket, source_key, bucket_name, s3_key)
+                fingerprints[s3_key] = obj['ETag'].strip('"')
+                copy_source = {'Bucket': source_bucket, 'Key': source_key}
+                future = manager.copy(
+                    copy_source, bucket_name, s3_key, subscribers=[KnownSizeSubscriber(obj['Size'])]
+                )
+                futures.append((source_key, future))
+
+        logger.info(f"Queued {len(futures)} objects for copy to bucket {bucket_name}")
+        for source_key, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Error copying object {source_key}: {e}")
+    return compute_dataset_token(fingerprints)
+
+class ResponseCache:
+    """In-memory cache of generated answers keyed by normalized query text"""
+
+    def __init__(self, ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[str, float]] = {}
+
+    @staticmethod
+    def _normalize(query: str) -> str:
+        """Fold case, whitespace and trailing punctuation so trivial rephrasings match"""
+        return " ".join(query.casefold().split()).rstrip("?.! ")
+
+    def get(self, query: str) -> Optional[str]:
+        """Return the cached answer for a query, or None if missing or expired"""
+        key = self._normalize(query)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        text, stored_at = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        return text
+
+    def put(self, query: str, text: str) -> None:
+        """Store the answer for a query"""
+        self._entries[self._normalize(query)] = (text, time.monotonic())
+
+@dataclass(frozen=True)
+class ResourceNames:
+    """Names of the resources that make up the sample knowledge base"""
+    knowledge_base_name: str
+    knowledge_base_description: str
+    data_bucket_name: str
+    vector_store_name: str
+
+def resolve_names(suffix: str) -> ResourceNames:
+    """Derive every resource name from a single suffix"""
+    return ResourceNames(
+        knowledge_base_name=f"bedrock-sample-knowledge-base-{suffix}",
+        knowledge_base_description="Multi data source knowledge base.",
+        data_bucket_name=f'bedrock-kb-{suffix}-1',
+        vector_store_name=f'bedrock-sample-rag-{suffix}'
+    )
+
+def main() -> None:
     """Main function to create a knowledge base"""
     try:
         # Create AWS session using default credentials (from SSO)
@@ -121,89 +366,75 @@ def main():
         region = session.region_name
         
         # Create AWS clients
-        s3_client = session.client('s3')
-        sts_client = session.client('sts')
-        bedrock_agent_client = session.client('bedrock-agent')
-        bedrock_agent_runtime_client = session.client('bedrock-agent-runtime')
-        aoss_client = session.client('opensearchserverless')
-        
-        # Get account ID
-        account_id = sts_client.get_caller_identity().get('Account')
-        logger.info(f"Using AWS account: {account_id} in region: {region}")
+        s3_client = session.client('s3', config=CLIENT_CONFIG)
+        bedrock_agent_client = session.client('bedrock-agent', config=CLIENT_CONFIG)
+        bedrock_agent_runtime_client = session.client('bedrock-agent-runtime', config=RUNTIME_CLIENT_CONFIG)
+        aoss_client = session.client('opensearchserverless', config=CLIENT_CONFIG)
         
-        # Create a unique suffix for resource names
-        timestamp_str = time.strftime("%Y%m%d%H%M%S", time.localtime(time.time()))[-7:]
-        suffix = f"{timestamp_str}"
-        
-        # Define resource names
-        knowledge_base_name = f"bedrock-sample-knowledge-base-{suffix}"
-        knowledge_base_description = "Multi data source knowledge base."
-        data_bucket_name = f'bedrock-kb-{suffix}-1'
-        vector_store_name = f'bedrock-sample-rag-{suffix}'
-        
-        # Define data sources
-        data_sources = [
-            {"type": "S3", "bucket_name": data_bucket_name}
-            # Add other data sources as needed
-        ]
+        logger.info(f"Using AWS region: {region}")
         
         kbAlreadyExists = True
-        if kbAlreadyExists:
-            knowledge_base_name = "bedrock-sample-knowledge-base-0232519"
-            knowledge_base_description = "Multi data source knowledge base."
-            data_bucket_name = 'bedrock-kb-0232519-1'
-            vector_store_name = 'bedrock-sample-rag-0232519-f'
 
+        # Reuse the existing knowledge base's suffix, or create a unique one
+        if kbAlreadyExists:
+            suffix = EXISTING_KB_SUFFIX
+        else:
+            suffix = time.strftime("%Y%m%d%H%M%S", time.localtime(time.time()))[-7:]
+        names = resolve_names(suffix)
+        
+        if kbAlreadyExists:
             # Get  existing knowledge base
-            existing_kb, existing_data_sources = get_existing_knowledge_base(bedrock_agent_client, knowledge_base_name)
+            existing_kb, existing_data_sources = get_existing_knowledge_base(bedrock_agent_client, names.knowledge_base_name)
 
 
-            logger.info(f"Using existing knowledge base: {knowledge_base_name}")
-            knowledge_base = existing_kb
+            logger.info(f"Using existing knowledge base: {names.knowledge_base_name}")
             data_sources = existing_data_sources
             
-            # Import the BedrockKnowledgeBase class
-            sys.path.append(str(Path(__file__).resolve().parent))
-            from utils.knowledge_base import BedrockKnowledgeBase
-            
             # Create a wrapper around the existing KB
-            kb_wrapper = BedrockKnowledgeBase(data_sources=data_sources, createKB=False, existingKB=knowledge_base)
+            knowledge_base: BedrockKnowledgeBase = BedrockKnowledgeBase(
+                data_sources=data_sources, createKB=False, existingKB=existing_kb
+            )
 
             
             # Override the knowledge_base and data_source attributes
-            kb_wrapper.knowledge_base = knowledge_base
-            kb_wrapper.data_source = data_sources
-            
-            knowledge_base = kb_wrapper
+            knowledge_base.knowledge_base = existing_kb
+            knowledge_base.data_source = data_sources
         else:
-            logger.info(f"Creating new knowledge base: {knowledge_base_name}")
+            # Define data sources
+            data_sources = [
+                {"type": "S3", "bucket_name": names.data_bucket_name}
+                # Add other data sources as needed
+            ]
+
+            logger.info(f"Creating new knowledge base: {names.knowledge_base_name}")
             
             # Check if OpenSearch collection exists
-            existing_collection = check_opensearch_collection_exists(aoss_client, vector_store_name)
-            
-            # Import the BedrockKnowledgeBase class
-            sys.path.append(str(Path(__file__).resolve().parent))
-            from utils.knowledge_base import BedrockKnowledgeBase
+            existing_collection = check_opensearch_collection_exists(aoss_client, names.vector_store_name)
             
             # Create a new knowledge base
             knowledge_base = BedrockKnowledgeBase(
-                kb_name=knowledge_base_name,
-                kb_description=knowledge_base_description,
+                kb_name=names.knowledge_base_name,
+                kb_description=names.knowledge_base_description,
                 data_sources=data_sources,
                 chunking_strategy="FIXED_SIZE",
                 suffix=suffix
             )
+            logger.info(f"Using AWS account: {knowledge_base.account_number}")
         
-            # Upload data to S3 bucket
+            # Seed the S3 bucket, server-side from S3_SOURCE_URI when it is set
+            source_uri = os.environ.get('S3_SOURCE_URI')
             data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "synthetic_dataset")
-            if os.path.exists(data_dir):
-                upload_directory(s3_client, data_dir, data_bucket_name)
+            dataset_token = None
+            if source_uri:
+                dataset_token = copy_s3_prefix(s3_client, source_uri, names.data_bucket_name)
+            elif os.path.exists(data_dir):
+                dataset_token = upload_directory(s3_client, data_dir, names.data_bucket_name)
             else:
                 logger.warning(f"Data directory {data_dir} does not exist, skipping upload")
             
-            # Start ingestion job
+            # Start ingestion job, keyed on the seeded dataset
             logger.info("Starting ingestion job...")
-            knowledge_base.start_ingestion_job()
+            knowledge_base.start_ingestion_job(client_token=dataset_token)
         
         # Get knowledge base ID for testing
         kb_id = knowledge_base.knowledge_base['knowledgeBaseId']
@@ -215,15 +446,38 @@ def main():
         
 
         logger.info(f"Testing knowledge base with query: {query}")
+        response_cache = ResponseCache()
+
+        # Open the runtime connection before the first prompt so the initial
+        # query does not also pay for the TLS handshake
+        try:
+            bedrock_agent_runtime_client.retrieve(
+                knowledgeBaseId=kb_id,
+                retrievalConfiguration={
+                    "vectorSearchConfiguration": {
+                        "numberOfResults": 1
+                    }
+                },
+                retrievalQuery={"text": query}
+            )
+        except Exception as e:
+            logger.warning(f"Runtime connection warm-up failed: {e}")
+
         # Loop requesting cli input until user enters 'exit'
         while True:
             query = input("\nEnter your query (or 'exit' to quit): ")
             if query.lower() == 'exit':
                 break
 
+            cached_text = response_cache.get(query)
+            if cached_text is not None:
+                print("\nRetrieve and Generate Response (cached):")
+                print(cached_text)
+                continue
+
 #            start_time = time()
             try:
-                response = bedrock_agent_runtime_client.retrieve_and_generate(
+                response = bedrock_agent_runtime_client.retrieve_and_generate_stream(
                     input={"text": query},
                     retrieveAndGenerateConfiguration={
                         "type": "KNOWLEDGE_BASE",
@@ -239,10 +493,23 @@ def main():
                     }
                 )
                 
+                # Print generated text as it arrives instead of waiting for the full answer
                 print("\nRetrieve and Generate Response:")
-                print(response['output']['text'])
+                output_parts = []
+                for event in response['stream']:
+                    if 'output' in event:
+                        text = event['output']['text']
+                        output_parts.append(text)
+                        print(text, end='', flush=True)
+                print()
+                # Don't cache empty answers, e.g. when a guardrail blocked the output
+                output_text = ''.join(output_parts)
+                if output_text:
+                    response_cache.put(query, output_text)
 #                print(f"\nResponse (took {time() - start_time:.2f} seconds):")
             except Exception as e:
+                # The stream may have failed partway through a line of output
+                print()
                 print(f"Error processing query: {str(e)}")
                 print("Try reformulating your question")
 
@@ -262,13 +529,15 @@ def main():
             }
         )
         
-        print("\nRetrieval Results:")
+        # Build the whole report first and write it to stdout once
+        lines = ["\nRetrieval Results:"]
         for num, chunk in enumerate(response_ret.get('retrievalResults', []), 1):
-            print(f'Chunk {num}: {chunk["content"]["text"]}')
-            print(f'Chunk {num} Location: {chunk["location"]}')
-            print(f'Chunk {num} Score: {chunk["score"]}')
-            print(f'Chunk {num} Metadata: {chunk["metadata"]}')
-            print()
+            lines.append(f'Chunk {num}: {chunk["content"]["text"]}')
+            lines.append(f'Chunk {num} Location: {chunk["location"]}')
+            lines.append(f'Chunk {num} Score: {chunk["score"]}')
+            lines.append(f'Chunk {num} Metadata: {chunk["metadata"]}')
+            lines.append('')
+        sys.stdout.write('\n'.join(lines) + '\n')
         
     except Exception as e:
         logger.error(f"Error in main function: {e}")
@@ -91,8 +91,6 @@ class BedrockKnowledgeBase:
         self.region_name = session.region_name
         self.iam_client = session.client('iam')
         self.lambda_client = session.client('lambda')
-        self.account_number = session.client('sts').get_caller_identity().get('Account')
-        self.identity = session.client('sts').get_caller_identity()['Arn']
         self.aoss_client = session.client('opensearchserverless')
         self.neptune_client = session.client('neptune-graph')
         self.s3_client = session.client('s3')
@@ -106,6 +104,11 @@ class BedrockKnowledgeBase:
             self.data_sources = data_sources
             print("Skipping Knowledge Base creation as dontCreateKB is set to True")
             return
+
+        # The account and caller identity are only needed to create resources
+        caller_identity = session.client('sts').get_caller_identity()
+        self.account_number = caller_identity.get('Account')
+        self.identity = caller_identity['Arn']
         
 
         self.suffix = suffix or f'{self.region_name}-{self.account_number}'
@@ -1113,24 +1116,59 @@ class BedrockKnowledgeBase:
         return ds_list
         
 
-    def start_ingestion_job(self):
+    def get_active_ingestion_jobs(self, data_source_id):
+        """
+        List the ingestion jobs of a data source that are still starting or in progress
+        Args:
+            data_source_id(str): The id of the data source to check.
+        """
+        paginator = self.bedrock_agent_client.get_paginator('list_ingestion_jobs')
+        active_jobs = []
+        for page in paginator.paginate(
+            knowledgeBaseId=self.knowledge_base['knowledgeBaseId'],
+            dataSourceId=data_source_id,
+            filters=[{'attribute': 'STATUS', 'operator': 'EQ', 'values': ['STARTING', 'IN_PROGRESS']}]
+        ):
+            active_jobs.extend(page.get('ingestionJobSummaries', []))
+        return active_jobs
+
+    def start_ingestion_job(self, client_token=None):
         """
         Start an ingestion job to synchronize data from an S3 bucket to the Knowledge Base
+        Data sources that already have a job starting or in progress are skipped.
+        Args:
+            client_token(str): Optional idempotency token, e.g. a SHA-256 over every dataset key and its
+                content ETag. Combined with each data source id so that retries for the same dataset
+                are deduplicated by Bedrock.
         """
 
         for idx, ds in enumerate(self.data_sources):
             try:
-                start_job_response = self.bedrock_agent_client.start_ingestion_job(
-                    knowledgeBaseId=self.knowledge_base['knowledgeBaseId'],
-                    dataSourceId=self.data_source[idx]["dataSourceId"]
-                )
+                data_source_id = self.data_source[idx]["dataSourceId"]
+                try:
+                    active_jobs = self.get_active_ingestion_jobs(data_source_id)
+                except Exception as e:
+                    # e.g. no ListIngestionJobs permission; start the job anyway
+                    print(f"Couldn't check for running ingestion jobs on data source {data_source_id}: {e}")
+                    active_jobs = []
+                if active_jobs:
+                    print(f"job {idx+1} skipped, an ingestion job is already running for data source {data_source_id}\n")
+                    continue
+
+                job_args = {
+                    'knowledgeBaseId': self.knowledge_base['knowledgeBaseId'],
+                    'dataSourceId': data_source_id
+                }
+                if client_token:
+                    job_args['clientToken'] = f"{client_token}-{data_source_id}"
+                start_job_response = self.bedrock_agent_client.start_ingestion_job(**job_args)
                 job = start_job_response["ingestionJob"]
                 print(f"job {idx+1} started successfully\n")
                 # pp.pprint(job)
                 while job['status'] not in ["COMPLETE", "FAILED", "STOPPED"]:
                     get_job_response = self.bedrock_agent_client.get_ingestion_job(
                         knowledgeBaseId=self.knowledge_base['knowledgeBaseId'],
-                        dataSourceId=self.data_source[idx]["dataSourceId"],
+                        dataSourceId=data_source_id,
                         ingestionJobId=job["ingestionJobId"]
                     )
                     job = get_job_response["ingestionJob"]